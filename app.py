@@ -2,22 +2,30 @@
 """
 Flask REST API for football statistics.
 Stores scraped data in SQLite and exposes:
-    POST /scrape       – trigger scraping
-    GET  /players      – list all players
+    POST /scrape       – queue a background scrape (202 + job id)
+    GET  /players      – one page of players (?limit=100, max 1000; ?after_id=)
     GET  /players/<id> – single player
     GET  /rank         – weighted ranking
-    GET  /status       – health / last-scrape info
+    GET  /status       – health / last-scrape info (?job_id= for progress)
 """
 
+import atexit
 import os
 import sqlite3
-import json
 import logging
+import threading
+import uuid
 from datetime import datetime
-from contextlib import closing
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
-from flask import Flask, jsonify, request, g
+import numpy as np
+import orjson
+import pandas as pd
+from flask import Flask, Response, jsonify, request, stream_with_context
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
+from numba import njit
 
 # ------------------------------------------------------------------
 # Logging
@@ -27,33 +35,93 @@ logging.basicConfig(
     format="%(asctime)s | %(levelname)s | %(message)s",
 )
 
+# ------------------------------------------------------------------
+# JSON
+# ------------------------------------------------------------------
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+class ORJSONProvider(JSONProvider):
+    """Flask JSON provider backed by orjson (C encoder/decoder)."""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=ORJSON_OPTIONS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 # ------------------------------------------------------------------
 # Flask setup
 # ------------------------------------------------------------------
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
 CORS(app)  # allow all origins – tighten in production
 app.config["DATABASE"] = os.getenv("DB_PATH", "football_stats.db")
 
 # ------------------------------------------------------------------
 # DB helpers
 # ------------------------------------------------------------------
-def get_db():
-    if "db" not in g:
-        g.db = sqlite3.connect(
-            app.config["DATABASE"],
-            detect_types=sqlite3.PARSE_DECLTYPES,
-        )
-        g.db.row_factory = sqlite3.Row  # dict-like rows
-    return g.db
+# One connection per (thread, role), kept open across requests. sqlite3
+# connections can't hop threads, so a threading.local is the pool.
+_local = threading.local()
 
-def close_db(e=None):
-    db = g.pop("db", None)
-    if db is not None:
+# Read-mostly tuning: bigger page cache (~20 MB), mmap'd reads, RAM temp
+DB_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",  # safe with WAL
+    "PRAGMA cache_size=-20000",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA temp_store=MEMORY",
+)
+
+def _connect(writable):
+    db = sqlite3.connect(
+        app.config["DATABASE"],
+        detect_types=sqlite3.PARSE_DECLTYPES,
+    )
+    db.row_factory = sqlite3.Row  # dict-like rows
+    for pragma in DB_PRAGMAS:
+        db.execute(pragma)
+    if not writable:
+        db.execute("PRAGMA query_only=1")
+    return db
+
+def get_db(writable=False):
+    """
+    Return this thread's pooled connection. Routes get a query_only one;
+    pass writable=True for the scrape writer and schema setup.
+    """
+    pool = getattr(_local, "pool", None)
+    if pool is None:
+        pool = _local.pool = {}
+    key = (app.config["DATABASE"], writable)
+    if key not in pool:
+        pool[key] = _connect(writable)
+    return pool[key]
+
+def close_db():
+    """Close this thread's pooled connections (requests leave them open)."""
+    for db in getattr(_local, "pool", {}).values():
         db.close()
+    _local.pool = {}
+
+atexit.register(close_db)
+
+# Derived metric column -> (DataFrame column, printf format for ?format=pretty)
+DERIVED_METRICS = {
+    "shooting_conversion_rate": ("Shooting_Conversion_Rate", "%.2f%%"),
+    "pass_completion_rate": ("Pass_Completion_Rate", "%.2f%%"),
+    "xg_overperformance": ("xG_Overperformance", "%.2f"),
+    "xa_overperformance": ("xA_Overperformance", "%.2f"),
+    "dribble_completion_rate": ("Dribble_Completion_Rate", "%.2f%%"),
+    "aerial_duels_win_percentage": ("Aerial_Duels_Win_Percentage", "%.2f%%"),
+}
 
-@app.teardown_appcontext
-def _close_db(error):
-    close_db()
+# json_object() key/value pairs for the derived metrics, formatted in SQL
+# only when the :pretty parameter is set
+_METRICS_JSON_ARGS = ",\n            ".join(
+    f"'{column}', CASE WHEN :pretty AND {column} IS NOT NULL "
+    f"THEN printf('{fmt}', {column}) ELSE {column} END"
+    for column, (_, fmt) in DERIVED_METRICS.items()
+)
 
 def init_db():
     """Create tables if they don’t exist."""
@@ -69,18 +137,33 @@ def init_db():
         assists      INTEGER,
         xg           REAL,
         xa           REAL,
-        data         TEXT,               -- JSON blob with all metrics
+        shooting_conversion_rate    REAL,
+        pass_completion_rate        REAL,
+        xg_overperformance          REAL,
+        xa_overperformance          REAL,
+        dribble_completion_rate     REAL,
+        aerial_duels_win_percentage REAL,
+        data         JSON,               -- JSON1 blob with all metrics
         updated_at   TIMESTAMP DEFAULT CURRENT_TIMESTAMP
     );
 
+    CREATE UNIQUE INDEX IF NOT EXISTS ux_players_name_squad
+        ON players(name, squad);
+
     CREATE TABLE IF NOT EXISTS meta (
         key   TEXT PRIMARY KEY,
         value TEXT
     );
     """
-    with closing(get_db()) as db:
-        db.executescript(schema)
-        db.commit()
+    db = get_db(writable=True)
+    db.execute("PRAGMA journal_mode=WAL")  # persistent, set once
+    db.executescript(schema)
+    # Databases created before the derived-metric columns existed
+    existing = {r["name"] for r in db.execute("PRAGMA table_info(players)")}
+    for column in DERIVED_METRICS:
+        if column not in existing:
+            db.execute(f"ALTER TABLE players ADD COLUMN {column} REAL")
+    db.commit()
 
 # ------------------------------------------------------------------
 # Scraper integration
@@ -97,30 +180,28 @@ from scraper import (
     calculate_derived_metrics,
 )
 
-DRIVER = None  # lazy init inside scrape task
-
-def get_driver():
-    global DRIVER
-    if DRIVER is None:
-        from selenium import webdriver
-        from selenium.webdriver.chrome.options import Options
-        opts = Options()
-        for arg in ("--headless", "--disable-gpu", "--window-size=1920,1080"):
-            opts.add_argument(arg)
-        DRIVER = webdriver.Chrome(options=opts)
-    return DRIVER
-
 def scrape_all():
     """Run full scraping pipeline and return DataFrame."""
     logging.info("Starting scrape job")
 
-    fbref = scrape_fbref_stats(
-        "https://fbref.com/en/comps/9/Premier-League-Stats", "Premier-League"
-    )
-    whoscored = scrape_whoscored_stats(
-        "https://www.whoscored.com/Regions/252/Tournaments/2/Seasons/9019/Stages/21135/PlayerStatistics/England-Premier-League-2022-2023"
-    )
-    understat = scrape_understat_stats("https://understat.com/league/EPL")
+    # Each source lives on a different host, so overlap the network waits.
+    # The WhoScored worker borrows the scraper's shared Selenium driver.
+    with ThreadPoolExecutor(max_workers=3) as ex:
+        fut_fbref = ex.submit(
+            scrape_fbref_stats,
+            "https://fbref.com/en/comps/9/Premier-League-Stats",
+            "Premier-League",
+        )
+        fut_whoscored = ex.submit(
+            scrape_whoscored_stats,
+            "https://www.whoscored.com/Regions/252/Tournaments/2/Seasons/9019/Stages/21135/PlayerStatistics/England-Premier-League-2022-2023",
+        )
+        fut_understat = ex.submit(
+            scrape_understat_stats, "https://understat.com/league/EPL"
+        )
+        fbref = fut_fbref.result()
+        whoscored = fut_whoscored.result()
+        understat = fut_understat.result()
 
     merged = merge_data_sources(fbref, whoscored, understat)
     if merged is None:
@@ -129,82 +210,279 @@ def scrape_all():
     logging.info("Scraping finished – %s players", len(final))
     return final
 
+# ------------------------------------------------------------------
+# Persistence helpers
+# ------------------------------------------------------------------
+UPSERT_PLAYER_SQL = """
+    INSERT INTO players(name, squad, age, position, minutes,
+                        goals, assists, xg, xa,
+                        shooting_conversion_rate, pass_completion_rate,
+                        xg_overperformance, xa_overperformance,
+                        dribble_completion_rate, aerial_duels_win_percentage,
+                        data)
+    VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
+    ON CONFLICT(name, squad) DO UPDATE SET
+        age=excluded.age,
+        minutes=excluded.minutes,
+        goals=excluded.goals,
+        assists=excluded.assists,
+        xg=excluded.xg,
+        xa=excluded.xa,
+        shooting_conversion_rate=excluded.shooting_conversion_rate,
+        pass_completion_rate=excluded.pass_completion_rate,
+        xg_overperformance=excluded.xg_overperformance,
+        xa_overperformance=excluded.xa_overperformance,
+        dribble_completion_rate=excluded.dribble_completion_rate,
+        aerial_duels_win_percentage=excluded.aerial_duels_win_percentage,
+        data=excluded.data,
+        updated_at=CURRENT_TIMESTAMP
+"""
+
+def _object_column(values):
+    """Series -> list of Python objects with NaN mapped to None (NULL)."""
+    return values.astype(object).where(values.notna(), None).tolist()
+
+def _float_column(values):
+    """Coerce a scraped column to floats; non-numeric cells become NULL."""
+    values = pd.to_numeric(values, errors="coerce")
+    return _object_column(values.where(np.isfinite(values)))
+
+def _int_column(values):
+    """Coerce a scraped column to ints; non-numeric cells become NULL."""
+    values = pd.to_numeric(values, errors="coerce")
+    values = np.trunc(values.where(np.isfinite(values)))
+    return _object_column(values.astype("Int64"))
+
+def persist_players(df):
+    """Upsert a scraped DataFrame into SQLite; returns the row count."""
+    db = get_db(writable=True)
+    metric_columns = [source for source, _ in DERIVED_METRICS.values()]
+    sub = df.reindex(
+        columns=["Player", "Squad", "Age", "Pos", "Min",
+                 "Goals", "Assists", "xG", "xA"] + metric_columns
+    )
+    # NaN -> None so the blob is valid JSON for SQLite's JSON1 functions
+    players = df.astype(object).where(df.notna(), None).to_dict(orient="records")
+    rows = list(zip(
+        _object_column(sub["Player"]),
+        # UNIQUE treats NULLs as distinct, so a NULL squad would never hit
+        # ON CONFLICT(name, squad) and be re-inserted every scrape
+        _object_column(sub["Squad"].fillna("")),
+        _int_column(sub["Age"]),
+        _object_column(sub["Pos"]),
+        _int_column(sub["Min"]),
+        _int_column(sub["Goals"]),
+        _int_column(sub["Assists"]),
+        _float_column(sub["xG"]),
+        _float_column(sub["xA"]),
+        *(_float_column(sub[c]) for c in metric_columns),
+        # full metrics as JSON
+        [orjson.dumps(p, option=ORJSON_OPTIONS).decode() for p in players],
+    ))
+    # The writer connection is pooled, so a failed batch must roll back
+    # rather than leave the transaction (and the WAL write lock) open
+    db.execute("BEGIN")
+    try:
+        db.executemany(UPSERT_PLAYER_SQL, rows)
+        db.execute(
+            "INSERT OR REPLACE INTO meta(key,value) VALUES (?,?)",
+            ("last_scrape", datetime.utcnow().isoformat()),
+        )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    _load_rank_scores.cache_clear()
+    db.execute("ANALYZE players")  # refresh planner stats after bulk load
+    return len(rows)
+
+# ------------------------------------------------------------------
+# Background scrape jobs
+# ------------------------------------------------------------------
+_executor = ThreadPoolExecutor(max_workers=1)
+_jobs = {}            # job_id -> Future, oldest first
+JOBS_KEPT = 20        # /status remembers only the most recent jobs
+_jobs_lock = threading.Lock()
+_active_job = None    # most recently queued job_id
+
+def _run_scrape_and_persist():
+    """Job body: scrape everything and write it to the DB."""
+    try:
+        return persist_players(scrape_all())
+    except Exception:
+        logging.exception("Scrape failed")
+        raise
+
+def _job_state(job_id, future):
+    if not future.done():
+        return {"job_id": job_id, "status": "running"}
+    exc = future.exception()
+    if exc is not None:
+        return {"job_id": job_id, "status": "failed", "error": str(exc)}
+    return {"job_id": job_id, "status": "done", "players_inserted": future.result()}
+
+# ------------------------------------------------------------------
+# Ranking
+# ------------------------------------------------------------------
+# fastmath minus "nnan"/"ninf": the kernel relies on NaN checks for NULLs
+@njit(cache=True, fastmath={"nsz", "arcp", "contract", "afn", "reassoc"})
+def _rank_score(goals, assists, minutes, xg, xa):
+    """Weighted score per player, fused into a single pass; NaN counts as 0."""
+    out = np.empty(goals.size, np.float64)
+    for i in range(goals.size):
+        g = 0.0 if np.isnan(goals[i]) else goals[i]
+        a = 0.0 if np.isnan(assists[i]) else assists[i]
+        m = 0.0 if np.isnan(minutes[i]) else minutes[i]
+        x = (0.0 if np.isnan(xg[i]) else xg[i]) + (0.0 if np.isnan(xa[i]) else xa[i])
+        out[i] = g * 4 + a * 3 + m * 0.01 + x * 2
+    return out
+
+def _last_scrape():
+    row = get_db().execute(
+        "SELECT value FROM meta WHERE key='last_scrape'"
+    ).fetchone()
+    return row["value"] if row else None
+
+# Cached /rank table. Stats are float64 (NULL -> NaN) so the score inputs
+# are plain views into the array; text columns stay object
+RANK_NUMERIC_FIELDS = ("goals", "assists", "minutes", "xg", "xa")
+RANK_INT_FIELDS = ("goals", "assists", "minutes")  # INTEGER in the schema
+RANK_DTYPE = np.dtype(
+    [("id", np.int64), ("name", object), ("squad", object), ("position", object)]
+    + [(name, np.float64) for name in RANK_NUMERIC_FIELDS]
+)
+
+@lru_cache(maxsize=1)
+def _load_rank_scores(last_scrape):
+    """
+    Load ranking inputs into a structured array and score them. Keyed on
+    meta.last_scrape and cleared by persist_players, so /rank calls
+    between scrapes reuse the same arrays.
+    """
+    rows = get_db().execute(
+        """
+        SELECT id, name, squad, position,
+               goals, assists, minutes, xg, xa
+        FROM players
+        WHERE minutes > 0
+        """
+    ).fetchall()
+    players = np.empty(len(rows), dtype=RANK_DTYPE)
+    for name in RANK_DTYPE.names:
+        values = [r[name] for r in rows]
+        if name in RANK_NUMERIC_FIELDS:
+            values = [np.nan if v is None else v for v in values]
+        players[name] = values
+
+    scores = _rank_score(*(players[name] for name in RANK_NUMERIC_FIELDS))
+    return players, scores
+
+def _rank_record(values):
+    """Structured-array row -> JSON-ready dict (NaN -> None, ints restored)."""
+    record = dict(zip(RANK_DTYPE.names, values))
+    for name in RANK_NUMERIC_FIELDS:
+        value = record[name]
+        if value != value:
+            record[name] = None
+        elif name in RANK_INT_FIELDS:
+            record[name] = int(value)
+    return record
+
 # ------------------------------------------------------------------
 # Routes
 # ------------------------------------------------------------------
 @app.route("/status", methods=["GET"])
 def status():
-    db = get_db()
-    row = db.execute("SELECT value FROM meta WHERE key='last_scrape'").fetchone()
-    last_scrape = row["value"] if row else None
-    return jsonify({"last_scrape": last_scrape, "status": "ok"})
+    """Health / last-scrape info; ?job_id=... also reports that scrape job."""
+    body = {"last_scrape": _last_scrape(), "status": "ok"}
+    job_id = request.args.get("job_id")
+    if job_id:
+        future = _jobs.get(job_id)
+        if future is None:
+            return jsonify({"error": "Unknown job"}), 404
+        body["job"] = _job_state(job_id, future)
+    return jsonify(body)
 
 @app.route("/scrape", methods=["POST"])
 def trigger_scrape():
-    """Scrape fresh data and persist to SQLite."""
-    try:
-        df = scrape_all()
-    except Exception as exc:
-        logging.exception("Scrape failed")
-        return jsonify({"error": str(exc)}), 500
+    """Queue a scrape in the background and return its job id (202)."""
+    global _active_job
+    with _jobs_lock:
+        # Single-flight: a running job absorbs further POSTs
+        if _active_job is not None and not _jobs[_active_job].done():
+            return jsonify({"job_id": _active_job, "status": "running"}), 202
+        job_id = uuid.uuid4().hex
+        _jobs[job_id] = _executor.submit(_run_scrape_and_persist)
+        _active_job = job_id
+        while len(_jobs) > JOBS_KEPT:
+            del _jobs[next(iter(_jobs))]
+    return jsonify({"job_id": job_id, "status": "queued"}), 202
 
-    # Upsert into DB
-    db = get_db()
-    players = df.to_dict(orient="records")
-    for p in players:
-        db.execute(
-            """INSERT INTO players(name, squad, age, position, minutes,
-                                   goals, assists, xg, xa, data)
-               VALUES (?,?,?,?,?,?,?,?,?,?)
-               ON CONFLICT(name, squad) DO UPDATE SET
-                   age=excluded.age,
-                   minutes=excluded.minutes,
-                   goals=excluded.goals,
-                   assists=excluded.assists,
-                   xg=excluded.xg,
-                   xa=excluded.xa,
-                   data=excluded.data,
-                   updated_at=CURRENT_TIMESTAMP;
-            """,
-            (
-                p.get("Player"),
-                p.get("Squad"),
-                int(p.get("Age", 0)) if str(p.get("Age")).isdigit() else None,
-                p.get("Pos"),
-                int(p.get("Min", 0)) if str(p.get("Min")).isdigit() else None,
-                int(p.get("Goals", 0)) if str(p.get("Goals")).isdigit() else None,
-                int(p.get("Assists", 0)) if str(p.get("Assists")).isdigit() else None,
-                float(p.get("xG", 0)) if p.get("xG") else None,
-                float(p.get("xA", 0)) if p.get("xA") else None,
-                json.dumps(p),  # full metrics as JSON
-            ),
-        )
-    db.execute(
-        "INSERT OR REPLACE INTO meta(key,value) VALUES (?,?)",
-        ("last_scrape", datetime.utcnow().isoformat()),
-    )
-    db.commit()
-    return jsonify({"players_inserted": len(players)})
+PLAYERS_PAGE_MAX = 1000
 
 @app.route("/players", methods=["GET"])
 def list_players():
-    db = get_db()
-    rows = db.execute(
-        "SELECT id, name, squad, age, position, minutes, goals, assists FROM players"
-    ).fetchall()
-    return jsonify([dict(r) for r in rows])
+    """
+    Keyset-paginated player list, streamed as a JSON array.
+    Accepts ?limit=N (default 100, max 1000) and ?after_id=ID (default 0);
+    pass the last id of a page as after_id to fetch the next one.
+    """
+    limit = request.args.get("limit", type=int, default=100)
+    limit = max(0, min(limit, PLAYERS_PAGE_MAX))
+    after_id = request.args.get("after_id", type=int, default=0)
+    rows = _stream_json_rows(
+        """
+        SELECT id, name, squad, age, position, minutes, goals, assists
+        FROM players
+        WHERE id > ?
+        ORDER BY id
+        LIMIT ?
+        """,
+        (after_id, limit),
+    )
+    return Response(stream_with_context(rows), mimetype="application/json")
+
+def _stream_json_rows(sql, params, batch_size=100):
+    """Yield a JSON array of query rows, one fetchmany batch at a time."""
+    # Query lazily: the connection must belong to the streaming context
+    cursor = get_db().execute(sql, params)
+    yield b"["
+    first = True
+    while True:
+        batch = cursor.fetchmany(batch_size)
+        if not batch:
+            break
+        for row in batch:
+            yield (b"" if first else b",") + orjson.dumps(dict(row))
+            first = False
+    yield b"]"
 
 @app.route("/players/<int:player_id>", methods=["GET"])
 def get_player(player_id):
+    """
+    Single player. Derived metrics are raw numbers unless ?format=pretty,
+    which renders them as strings (e.g. "12.34%").
+    """
+    pretty = request.args.get("format") == "pretty"
+    # SQLite assembles the JSON document itself; no Python round-trip
     db = get_db()
     row = db.execute(
-        "SELECT * FROM players WHERE id=?", (player_id,)
+        f"""
+        SELECT json_object(
+            'id', id, 'name', name, 'squad', squad, 'age', age,
+            'position', position, 'minutes', minutes, 'goals', goals,
+            'assists', assists, 'xg', xg, 'xa', xa,
+            {_METRICS_JSON_ARGS},
+            'data', json(IFNULL(data, '{{}}')),
+            'updated_at', updated_at
+        )
+        FROM players WHERE id=:id
+        """,
+        {"id": player_id, "pretty": pretty},
     ).fetchone()
     if not row:
         return jsonify({"error": "Not found"}), 404
-    player = dict(row)
-    player["data"] = json.loads(player["data"]) if player["data"] else {}
-    return jsonify(player)
+    return Response(row[0], mimetype="application/json")
 
 @app.route("/rank", methods=["GET"])
 def rank_players():
@@ -214,19 +492,16 @@ def rank_players():
     Accepts ?top=N (default 20)
     """
     top = request.args.get("top", type=int, default=20)
-    db = get_db()
-    rows = db.execute(
-        """
-        SELECT id, name, squad, position,
-               goals, assists, minutes, xg, xa
-        FROM players
-        WHERE minutes > 0
-        ORDER BY (goals*4 + assists*3 + minutes*0.01 + (IFNULL(xg,0)+IFNULL(xa,0))*2) DESC
-        LIMIT ?
-        """,
-        (top,),
-    ).fetchall()
-    return jsonify([dict(r) for r in rows])
+    if top <= 0:
+        return jsonify([])
+    players, scores = _load_rank_scores(_last_scrape())
+    if top < len(scores):
+        # O(n) selection of the top N, then order just those
+        idx = np.argpartition(-scores, top)[:top]
+        idx = idx[np.argsort(-scores[idx], kind="stable")]
+    else:
+        idx = np.argsort(-scores, kind="stable")
+    return jsonify([_rank_record(rec) for rec in players[idx].tolist()])
 
 # ------------------------------------------------------------------
 # CLI helper
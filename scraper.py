@@ -1,23 +1,182 @@
-import requests from bs4 import BeautifulSoup
+import atexit
+import io
+import json
+import os
+import requests
+import requests_cache
 import pandas as pd
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import lxml.html
 import numpy as np
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import TimeoutException, WebDriverException
 import re
 
-# Configure Selenium WebDriver
-chrome_options = Options()
-chrome_options.add_argument("--headless")
-chrome_options.add_argument("--disable-gpu")
-chrome_options.add_argument("--window-size=1920,1080")
+# Shared WebDriver: started on first use, quit after DRIVER_IDLE_TIMEOUT
+# seconds without users so idle workers don't keep Chrome resident
+DRIVER_IDLE_TIMEOUT = 10 * 60
+_driver = None
+_driver_users = 0
+_driver_idle_timer = None
+_driver_lock = threading.Lock()
+# Held for a whole scrape: a WebDriver drives one page and can't be shared
+_driver_use_lock = threading.Lock()
 
-# Initialize the WebDriver
-driver = webdriver.Chrome(options=chrome_options)
+def _new_driver():
+    """
+    Launch a headless Chrome WebDriver
+    """
+    options = Options()
+    options.add_argument("--headless")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--window-size=1920,1080")
+    return webdriver.Chrome(options=options)
+
+def get_driver():
+    """
+    Return the shared WebDriver, starting Chrome if needed
+
+    Every call must be paired with release_driver().
+    """
+    global _driver, _driver_users, _driver_idle_timer
+    with _driver_lock:
+        if _driver_idle_timer is not None:
+            _driver_idle_timer.cancel()
+            _driver_idle_timer = None
+        if _driver is None:
+            _driver = _new_driver()
+        _driver_users += 1
+        return _driver
+
+def release_driver():
+    """
+    Drop a reference taken by get_driver(); the last one arms the idle timer
+    """
+    global _driver_users, _driver_idle_timer
+    with _driver_lock:
+        _driver_users -= 1
+        if _driver_users == 0 and _driver is not None:
+            _driver_idle_timer = threading.Timer(DRIVER_IDLE_TIMEOUT, _quit_idle_driver)
+            _driver_idle_timer.daemon = True
+            _driver_idle_timer.start()
+
+def _quit_idle_driver():
+    with _driver_lock:
+        if _driver_users == 0:
+            _quit_driver()
+
+def _quit_driver():
+    global _driver, _driver_idle_timer
+    if _driver_idle_timer is not None:
+        _driver_idle_timer.cancel()
+        _driver_idle_timer = None
+    if _driver is not None:
+        _driver.quit()
+        _driver = None
+
+def _discard_driver(driver):
+    """
+    Forget a driver whose session failed so the next scrape starts a fresh one
+    """
+    global _driver
+    with _driver_lock:
+        if _driver is not driver:
+            return
+        _driver = None
+    try:
+        driver.quit()
+    except WebDriverException:
+        pass  # Chrome is already gone
+
+def close_driver():
+    """
+    Quit the shared WebDriver if it was ever started
+    """
+    with _driver_lock:
+        _quit_driver()
+
+atexit.register(close_driver)
+
+# FBref rate limit: at most one request per FBREF_MIN_INTERVAL seconds
+FBREF_MIN_INTERVAL = 1.0
+_fbref_lock = threading.Lock()
+_fbref_last_request = 0.0
+
+def _fbref_throttle():
+    """
+    Block until the next FBref request is allowed
+    """
+    global _fbref_last_request
+    with _fbref_lock:
+        wait = _fbref_last_request + FBREF_MIN_INTERVAL - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        _fbref_last_request = time.monotonic()
+
+# One keep-alive session for every FBref table, with an on-disk HTTP cache
+# so unchanged tables are revalidated (ETag -> 304) instead of re-downloaded.
+# Created on first use so importing this module doesn't touch the disk.
+FBREF_CACHE_PATH = os.getenv(
+    "FBREF_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "fbref_cache.sqlite"),
+)
+_fbref_session = None
+_fbref_session_lock = threading.Lock()
+
+def _get_fbref_session():
+    """
+    Return the shared FBref session, creating it (and its cache) if needed
+    """
+    global _fbref_session
+    with _fbref_session_lock:
+        if _fbref_session is None:
+            session = requests_cache.CachedSession(
+                FBREF_CACHE_PATH, backend='sqlite', expire_after=3600
+            )
+            session.headers.update({
+                'Accept-Encoding': 'gzip, deflate',
+                'User-Agent': 'Mozilla/5.0 (compatible; football-stats-app)',
+            })
+            _fbref_session = session
+        return _fbref_session
+
+def _fetch_fbref_table(table_id, table_url, table_name):
+    """
+    Download and clean a single FBref table (runs in a worker thread)
+    """
+    print(f"Scraping {table_name} table...")
+    _fbref_throttle()
+    response = _get_fbref_session().get(table_url, timeout=30)
+    response.raise_for_status()
+    
+    # FBref ships the player tables inside HTML comments
+    html = response.text.replace('<!--', '').replace('-->', '')
+    
+    # Use pandas to read just the player table
+    df_list = pd.read_html(io.StringIO(html), attrs={'id': f'stats_{table_id}'})
+    if not df_list:
+        print(f"No table found for {table_name}")
+        return None
+        
+    df = df_list[0]
+    
+    # Handle multi-level columns
+    if isinstance(df.columns, pd.MultiIndex):
+        # Flatten the multi-index
+        df.columns = [' '.join(col).strip() for col in df.columns.values]
+    
+    # Remove non-player rows (squad totals, etc.)
+    if 'Rk' in df.columns:
+        df = df[df['Rk'].astype(str).str.isdigit()]
+        df['Rk'] = df['Rk'].astype(int)
+    
+    return df
 
 def scrape_fbref_stats(league_url, season):
     """
@@ -39,54 +198,163 @@ def scrape_fbref_stats(league_url, season):
         "misc": "Miscellaneous Stats"
     }
     
+    # Construct the URL for each table
+    urls = {
+        table_id: f"{base_url}/stats/{season}-Stats" if table_id == "standard"
+        else f"{base_url}/{table_id}/{season}-Stats"
+        for table_id in tables
+    }
+    
     # Dictionary to store all dataframes
     dfs = {}
     
-    # Scrape each table
-    for table_id, table_name in tables.items():
-        print(f"Scraping {table_name} table...")
-        
-        # Construct the URL for this table
-        if table_id == "standard":
-            table_url = f"{base_url}/stats/{season}-Stats"
-        else:
-            table_url = f"{base_url}/{table_id}/{season}-Stats"
-        
-        try:
-            # Use pandas to read the HTML table
-            df_list = pd.read_html(table_url)
-            if not df_list:
-                print(f"No table found for {table_name}")
+    # Fetch the tables concurrently; _fbref_throttle keeps us polite
+    with ThreadPoolExecutor(max_workers=3) as ex:
+        futures = {
+            ex.submit(_fetch_fbref_table, table_id, url, tables[table_id]): table_id
+            for table_id, url in urls.items()
+        }
+        for future in as_completed(futures):
+            table_id = futures[future]
+            try:
+                df = future.result()
+            except Exception as e:
+                print(f"Error scraping {tables[table_id]} table: {e}")
                 continue
-                
-            df = df_list[0]
-            
-            # Handle multi-level columns
-            if isinstance(df.columns, pd.MultiIndex):
-                # Flatten the multi-index
-                df.columns = [' '.join(col).strip() for col in df.columns.values]
-            
-            # Remove non-player rows (squad totals, etc.)
-            if 'Rk' in df.columns:
-                df = df[df['Rk'].apply(lambda x: str(x).isdigit())]
-                df['Rk'] = df['Rk'].astype(int)
-            
-            # Store the dataframe
-            dfs[table_id] = df
-            
-            # Be respectful - add a delay
-            time.sleep(3)
-            
-        except Exception as e:
-            print(f"Error scraping {table_name} table: {e}")
-            continue
+            if df is not None:
+                dfs[table_id] = df
     
-    return dfs
+    # Keep the table order stable for the merge step
+    return {table_id: dfs[table_id] for table_id in tables if table_id in dfs}
 
-def scrape_whoscored_stats(league_url):
+# WhoScored's tables are filled from this XHR feed; calling it directly
+# skips launching Chrome whenever the site lets a plain HTTP client through
+WHOSCORED_FEED_URL = "https://www.whoscored.com/StatisticsFeed/1/GetPlayerStatistics"
+_WHOSCORED_IDS_RE = re.compile(r"/Tournaments/(\d+)/.*/Stages/(\d+)/")
+_WHOSCORED_MODEL_MODE_RE = re.compile(r"'Model-last-Mode'\s*:\s*'([^']+)'")
+
+# Feed field -> Summary table column. Like the Selenium table, there's no
+# 'Team' column: WhoScored team names ("Man Utd") don't match FBref squads,
+# so merge_data_sources must keep skipping WhoScored until they're mapped
+WHOSCORED_FEED_COLUMNS = {
+    'name': 'Player',
+    'age': 'Age',
+    'positionText': 'Position',
+    'apps': 'Apps',
+    'minsPlayed': 'Mins',
+    'goal': 'Goals',
+    'assistTotal': 'Assists',
+    'yellowCard': 'Yel',
+    'redCard': 'Red',
+    'shotsPerGame': 'SpG',
+    'passSuccess': 'PS%',
+    'aerialWonPerGame': 'AerialsWon',
+    'manOfTheMatch': 'MotM',
+    'rating': 'Rating',
+}
+
+def scrape_whoscored_stats(league_url, driver=None):
     """
     Scrape player statistics from WhoScored
+
+    Tries the JSON feed first and only falls back to Selenium if it is
+    blocked. Uses the injected driver if given, otherwise borrows the
+    shared one.
+    """
+    try:
+        return _fetch_whoscored_feed(league_url)
+    except (requests.RequestException, ValueError, KeyError, TypeError) as e:
+        print(f"WhoScored feed unavailable ({e}), falling back to Selenium")
+    
+    if driver is not None:
+        return _scrape_whoscored_tables(league_url, driver)
+    # Acquire outside the try: a failed launch must not release a reference
+    driver = get_driver()
+    try:
+        with _driver_use_lock:
+            return _scrape_whoscored_tables(league_url, driver)
+    except WebDriverException:
+        _discard_driver(driver)
+        raise
+    finally:
+        release_driver()
+
+def _fetch_whoscored_feed(league_url):
+    """
+    Fetch the Summary stats straight from WhoScored's statistics feed
+    """
+    ids = _WHOSCORED_IDS_RE.search(league_url)
+    if not ids:
+        raise ValueError("no tournament/stage id in WhoScored URL")
+    tournament_id, stage_id = ids.groups()
+    
+    print(f"Fetching WhoScored feed for stage {stage_id}")
+    with requests.Session() as session:
+        players = _fetch_whoscored_feed_pages(session, league_url, tournament_id, stage_id)
+    
+    # A bot wall can let the XHR through with no data; treat that as blocked
+    if not players:
+        raise ValueError("WhoScored feed returned no players")
+    
+    columns = list(WHOSCORED_FEED_COLUMNS)
+    return {
+        "Summary": {
+            "headers": list(WHOSCORED_FEED_COLUMNS.values()),
+            "rows": [[p.get(col) for col in columns] for p in players],
+        }
+    }
+
+def _fetch_whoscored_feed_pages(session, league_url, tournament_id, stage_id):
+    """
+    Return every player record from the paged WhoScored feed
+    """
+    session.headers['User-Agent'] = 'Mozilla/5.0 (compatible; football-stats-app)'
+    
+    # Bootstrap cookies (and the feed's mode token) from the page itself
+    page = session.get(league_url, timeout=15)
+    page.raise_for_status()
+    headers = {'X-Requested-With': 'XMLHttpRequest', 'Referer': league_url}
+    mode = _WHOSCORED_MODEL_MODE_RE.search(page.text)
+    if mode:
+        headers['Model-last-Mode'] = mode.group(1)
+    
+    params = {
+        'category': 'summary',
+        'subcategory': 'all',
+        'statsAccumulationType': 0,
+        'isCurrent': 'true',
+        'stageId': stage_id,
+        'tournamentOptions': tournament_id,
+        'sortBy': 'Rating',
+        'field': 'Overall',
+        'isMinApp': 'false',
+        'includeZeroValues': 'true',
+    }
+    
+    # The feed is paged; keep going until the last page
+    players = []
+    page_number, total_pages = 1, 1
+    while page_number <= total_pages:
+        response = session.get(
+            WHOSCORED_FEED_URL,
+            params={**params, 'page': page_number},
+            headers=headers,
+            timeout=15,
+        )
+        response.raise_for_status()
+        payload = response.json()
+        players.extend(payload['playerTableStats'])
+        total_pages = (payload.get('paging') or {}).get('totalPages') or 1
+        page_number += 1
+    return players
+
+def _cell_text(element):
+    """
+    Visible text of an lxml element with whitespace collapsed, like Selenium's .text
     """
+    return ' '.join(element.text_content().split())
+
+def _scrape_whoscored_tables(league_url, driver):
     print(f"Scraping WhoScored data from: {league_url}")
     driver.get(league_url)
     
@@ -124,16 +392,13 @@ def scrape_whoscored_stats(league_url):
             print(f"Timed out waiting for {tab_name} table to load")
             continue
         
-        # Get table data
+        # Pull the rendered table in one WebDriver call and parse it locally
         table = driver.find_element(By.ID, table_id)
-        headers = [th.text.strip() for th in table.find_elements(By.TAG_NAME, "th")]
+        root = lxml.html.fromstring(table.get_attribute("outerHTML"))
+        headers = [_cell_text(th) for th in root.xpath(".//th")]
         
-        # Get all rows
-        rows = []
-        for tr in table.find_elements(By.TAG_NAME, "tr")[1:]:  # Skip header row
-            cells = [td.text.strip() for td in tr.find_elements(By.TAG_NAME, "td")]
-            if cells:
-                rows.append(cells)
+        # Get all rows that have data cells (skips the header row)
+        rows = [[_cell_text(td) for td in tr.xpath("./td")] for tr in root.xpath(".//tr[td]")]
         
         # Store data
         all_data[tab_name] = {
@@ -143,52 +408,52 @@ def scrape_whoscored_stats(league_url):
     
     return all_data
 
+# Understat JSON field -> column name used by the merge step
+UNDERSTAT_COLUMNS = {
+    'player_name': 'Player',
+    'team_title': 'Team',
+    'games': 'Games',
+    'goals': 'Goals',
+    'xG': 'xG',
+    'assists': 'Assists',
+    'xA': 'xA',
+    'shots': 'Shots',
+    'key_passes': 'Key Passes',
+    'yellow_cards': 'Yellow Cards',
+    'red_cards': 'Red Cards',
+}
+
+# Embedded players blob: var playersData = JSON.parse('...')
+_UNDERSTAT_PLAYERS_RE = re.compile(r"playersData\s*=\s*JSON\.parse\('([^']+)'\)")
+
 def scrape_understat_stats(league_url):
     """
     Scrape xG and xA data from Understat
+
+    The players table is rendered client-side from a JSON blob embedded in
+    the page, so we decode that blob instead of parsing the HTML.
     """
     print(f"Scraping Understat data from: {league_url}")
-    response = requests.get(league_url)
-    soup = BeautifulSoup(response.text, 'html.parser')
+    html = requests.get(league_url, timeout=10).text
     
-    # Find the players table
-    table = soup.find('table', {'class': 'players'})
-    if not table:
-        print("Could not find players table on Understat")
+    # Find the embedded players data
+    match = _UNDERSTAT_PLAYERS_RE.search(html)
+    if not match:
+        print("Could not find players data on Understat")
         return None
     
-    # Extract headers
-    headers = []
-    header_row = table.find('tr')
-    for th in header_row.find_all('th'):
-        headers.append(th.text.strip())
-    
-    # Extract player data
-    players_data = []
-    for row in table.find_all('tr')[1:]:  # Skip header row
-        cells = row.find_all('td')
-        if len(cells) < 2:
-            continue
-            
-        player_data = {}
-        player_name = cells[0].text.strip()
-        team_name = cells[1].text.strip()
-        
-        player_data['Player'] = player_name
-        player_data['Team'] = team_name
-        player_data['Games'] = cells[2].text.strip()
-        player_data['Goals'] = cells[3].text.strip()
-        player_data['xG'] = cells[4].text.strip()
-        player_data['Assists'] = cells[5].text.strip()
-        player_data['xA'] = cells[6].text.strip()
-        player_data['Shots'] = cells[7].text.strip()
-        player_data['Key Passes'] = cells[8].text.strip()
-        player_data['Yellow Cards'] = cells[9].text.strip()
-        player_data['Red Cards'] = cells[10].text.strip()
-        
-        players_data.append(player_data)
+    raw = bytes(match.group(1), 'utf-8').decode('unicode_escape')
+    players = json.loads(raw)
     
-    return pd.DataFrame(players_data)
+    df = pd.DataFrame(players).rename(columns=UNDERSTAT_COLUMNS)
+    return df.reindex(columns=list(UNDERSTAT_COLUMNS.values()))
+
+def _indexed(df):
+    """
+    Index a source frame on (Player, Squad), keeping the first row per key
+    """
+    df = df.set_index(['Player', 'Squad'])
+    return df[~df.index.duplicated()]
 
 def merge_data_sources(fbref_dfs, whoscored_data, understat_df):
     """
@@ -198,132 +463,78 @@ def merge_data_sources(fbref_dfs, whoscored_data, understat_df):
     if 'standard' not in fbref_dfs:
         print("No FBref standard data available")
         return None
-        
-    merged_df = fbref_dfs['standard'].copy()
     
-    # Merge other FBref tables
-    for table_name, df in fbref_dfs.items():
-        if table_name == 'standard':
-            continue
-            
-        # Identify common columns (excluding Player and Squad)
-        common_cols = set(merged_df.columns) & set(df.columns)
-        common_cols = [col for col in common_cols if col not in ['Player', 'Squad']]
-        
-        # Drop common columns from the df we're about to merge
-        if common_cols:
-            df = df.drop(columns=common_cols)
-        
-        # Merge on Player and Squad
-        merged_df = pd.merge(merged_df, df, on=['Player', 'Squad'], how='outer')
+    # Every source is aligned on (Player, Squad); standard comes first so
+    # its columns win when sources share a column name
+    frames = [_indexed(fbref_dfs['standard'])]
+    frames += [_indexed(df) for name, df in fbref_dfs.items() if name != 'standard']
     
     # Process WhoScored data
     if whoscored_data and 'Summary' in whoscored_data:
         # Convert WhoScored data to DataFrame
         summary_data = whoscored_data['Summary']
-        headers = summary_data['headers']
-        rows = summary_data['rows']
-        
-        whoscored_df = pd.DataFrame(rows, columns=headers)
+        whoscored_df = pd.DataFrame(summary_data['rows'], columns=summary_data['headers'])
         
         # Rename columns to match FBref format
         if 'Player' in whoscored_df.columns and 'Team' in whoscored_df.columns:
             whoscored_df = whoscored_df.rename(columns={'Team': 'Squad'})
-            
-            # Merge with main dataframe
-            common_cols = set(merged_df.columns) & set(whoscored_df.columns)
-            common_cols = [col for col in common_cols if col not in ['Player', 'Squad']]
-            
-            if common_cols:
-                whoscored_df = whoscored_df.drop(columns=common_cols)
-                
-            merged_df = pd.merge(merged_df, whoscored_df, on=['Player', 'Squad'], how='outer')
+            frames.append(_indexed(whoscored_df))
     
     # Merge Understat data
     if understat_df is not None and not understat_df.empty:
         # Rename columns to match
         understat_df = understat_df.rename(columns={'Team': 'Squad'})
-        
-        # Merge with main dataframe
-        common_cols = set(merged_df.columns) & set(understat_df.columns)
-        common_cols = [col for col in common_cols if col not in ['Player', 'Squad']]
-        
-        if common_cols:
-            understat_df = understat_df.drop(columns=common_cols)
-            
-        merged_df = pd.merge(merged_df, understat_df, on=['Player', 'Squad'], how='outer')
+        frames.append(_indexed(understat_df))
     
-    return merged_df
+    # One outer alignment over all sources instead of a merge per source
+    merged_df = pd.concat(frames, axis=1, join='outer')
+    merged_df = merged_df.loc[:, ~merged_df.columns.duplicated()]
+    return merged_df.rename_axis(['Player', 'Squad']).reset_index()
+
+def _percentage(numerator, denominator):
+    """
+    Return numerator / denominator as a percentage
+
+    0 where the denominator is a real zero, NaN where either input is unknown.
+    """
+    rate = (numerator / denominator * 100).where(denominator > 0, 0.0)
+    return rate.where(numerator.notna() & denominator.notna())
 
 def calculate_derived_metrics(df):
     """
     Calculate derived metrics from the base statistics
+
+    Rates and overperformance are left as floats (NaN where unknown);
+    formatting is up to whoever presents them.
     """
+    # Coerce source columns once; non-numeric cells become NaN
+    def numeric(col):
+        return pd.to_numeric(df[col], errors='coerce')
+    
     # Calculate shooting conversion rate
     if 'Goals' in df.columns and 'Sh' in df.columns:
-        try:
-            df['Shooting_Conversion_Rate'] = df.apply(
-                lambda row: f"{(float(row['Goals']) / float(row['Sh']) * 100):.2f}%" 
-                if float(row['Sh']) > 0 else "0.00%", 
-                axis=1
-            )
-        except (ValueError, ZeroDivisionError):
-            df['Shooting_Conversion_Rate'] = "0.00%"
+        df['Shooting_Conversion_Rate'] = _percentage(numeric('Goals'), numeric('Sh'))
     
     # Calculate pass completion rate
     if 'Cmp' in df.columns and 'Att' in df.columns:
-        try:
-            df['Pass_Completion_Rate'] = df.apply(
-                lambda row: f"{(float(row['Cmp']) / float(row['Att']) * 100):.2f}%" 
-                if float(row['Att']) > 0 else "0.00%", 
-                axis=1
-            )
-        except (ValueError, ZeroDivisionError):
-            df['Pass_Completion_Rate'] = "0.00%"
+        df['Pass_Completion_Rate'] = _percentage(numeric('Cmp'), numeric('Att'))
     
     # Calculate xG overperformance
     if 'Goals' in df.columns and 'xG' in df.columns:
-        try:
-            df['xG_Overperformance'] = df.apply(
-                lambda row: f"{float(row['Goals']) - float(row['xG']):.2f}" 
-                if pd.notna(row['xG']) else "N/A", 
-                axis=1
-            )
-        except (ValueError, TypeError):
-            df['xG_Overperformance'] = "N/A"
+        df['xG_Overperformance'] = numeric('Goals') - numeric('xG')
     
     # Calculate xA overperformance
     if 'Assists' in df.columns and 'xA' in df.columns:
-        try:
-            df['xA_Overperformance'] = df.apply(
-                lambda row: f"{float(row['Assists']) - float(row['xA']):.2f}" 
-                if pd.notna(row['xA']) else "N/A", 
-                axis=1
-            )
-        except (ValueError, TypeError):
-            df['xA_Overperformance'] = "N/A"
+        df['xA_Overperformance'] = numeric('Assists') - numeric('xA')
     
     # Calculate dribble completion rate
     if 'Dribbles Succ' in df.columns and 'Dribbles Att' in df.columns:
-        try:
-            df['Dribble_Completion_Rate'] = df.apply(
-                lambda row: f"{(float(row['Dribbles Succ']) / float(row['Dribbles Att']) * 100):.2f}%" 
-                if float(row['Dribbles Att']) > 0 else "0.00%", 
-                axis=1
-            )
-        except (ValueError, ZeroDivisionError):
-            df['Dribble_Completion_Rate'] = "0.00%"
+        df['Dribble_Completion_Rate'] = _percentage(numeric('Dribbles Succ'), numeric('Dribbles Att'))
     
     # Calculate aerial duel win percentage
     if 'Aerial Duels Won' in df.columns and 'Aerial Duels Lost' in df.columns:
-        try:
-            df['Aerial_Duels_Win_Percentage'] = df.apply(
-                lambda row: f"{(float(row['Aerial Duels Won']) / (float(row['Aerial Duels Won']) + float(row['Aerial Duels Lost'])) * 100):.2f}%" 
-                if (float(row['Aerial Duels Won']) + float(row['Aerial Duels Lost'])) > 0 else "0.00%", 
-                axis=1
-            )
-        except (ValueError, ZeroDivisionError):
-            df['Aerial_Duels_Win_Percentage'] = "0.00%"
+        won = numeric('Aerial Duels Won')
+        df['Aerial_Duels_Win_Percentage'] = _percentage(won, won + numeric('Aerial Duels Lost'))
     
     # Add placeholders for metrics not available from these sources
     df['Top_Speed'] = "N/A"
@@ -336,6 +547,16 @@ def calculate_derived_metrics(df):
     
     return df
 
+# How save_to_spreadsheet renders each derived metric
+DERIVED_METRIC_FORMATS = {
+    "Shooting_Conversion_Rate": "{:.2f}%",
+    "Pass_Completion_Rate": "{:.2f}%",
+    "xG_Overperformance": "{:.2f}",
+    "xA_Overperformance": "{:.2f}",
+    "Dribble_Completion_Rate": "{:.2f}%",
+    "Aerial_Duels_Win_Percentage": "{:.2f}%",
+}
+
 def save_to_spreadsheet(df, filename="footballers_stats.csv"):
     """
     Save player data to a CSV spreadsheet
@@ -359,7 +580,13 @@ def save_to_spreadsheet(df, filename="footballers_stats.csv"):
     
     # Filter to only include columns that exist in our DataFrame
     available_columns = [col for col in desired_columns if col in df.columns]
-    df = df[available_columns]
+    df = df[available_columns].copy()
+    
+    # Derived metrics are stored as floats; render them for the spreadsheet
+    for col, fmt in DERIVED_METRIC_FORMATS.items():
+        if col in df.columns:
+            values = pd.to_numeric(df[col], errors='coerce')
+            df[col] = values.map(fmt.format).where(values.notna(), "N/A")
     
     # Save to CSV
     df.to_csv(filename, index=False)
@@ -395,7 +622,7 @@ def main():
     print(f"Data includes {len(df.columns)} different metrics")
     
     # Close the WebDriver
-    driver.quit()
+    close_driver()
 
 if __name__ == "__main__":
     main()